@@ -2,7 +2,6 @@ from pathlib import Path
 import sys
 import json
 from datetime import datetime, timezone
-import pandas as pd
 
 # ------------------------------------------------------------
 # Make src/ importable
@@ -14,6 +13,7 @@ if str(SRC) not in sys.path:
 #------------- 
 from bootcamp_data.config import make_paths
 from bootcamp_data.io import (
+    csv_to_parquet_chunked,
     read_users_csv,
     write_parquet,
 )
@@ -27,18 +27,18 @@ def main() -> None:
 
     #Read raw data
 
-    # Read orders with enforced dtype
-    orders = pd.read_csv(
+    # Stream orders CSV -> parquet in blocks (never holds the whole file)
+    # raw layer stays text; typing happens in enforce_schema (Day 2)
+    csv_to_parquet_chunked(
         paths.raw / "orders.csv",
-        dtype={"user_id": str}
+        paths.processed / "orders.parquet",
+        string_cols=["order_id", "user_id", "amount", "quantity", "created_at", "status"],
     )
 
-    
     # Read users (unchanged)
     users = read_users_csv(paths.raw / "users.csv")
 
     # Write processed data
-    write_parquet(orders, paths.processed / "orders.parquet")
     write_parquet(users, paths.processed / "users.parquet")
 
     print("1- Wrote data/processed/orders.parquet")
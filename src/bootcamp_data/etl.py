@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+try:  # optional: serialize + UTF-8 encode in one pass
+    import orjson
+except ImportError:
+    orjson = None
+
 # Day 1 I/O
 from bootcamp_data.io import read_orders_csv, read_users_csv, write_parquet
 
@@ -20,11 +27,10 @@ from bootcamp_data.quality import (
 # Day 2/3 transforms
 from bootcamp_data.transforms import (
     enforce_schema,
-    normalize_text,
+    normalize_categories,
     apply_mapping,
-    add_missing_flags,
-    parse_datetime,
-    add_time_parts,
+    missing_flags,
+    parse_time_parts,
     winsorize,
     add_outlier_flag,
 )
@@ -34,6 +40,11 @@ from bootcamp_data.joins import safe_left_join
 
 log = logging.getLogger(__name__)
 
+# Copy-on-Write: .assign/.pipe share unchanged columns instead of copying.
+# Always on (and the option deprecated) from pandas 3.0.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 
 @dataclass(frozen=True)
 class ETLConfig:
@@ -46,12 +57,28 @@ class ETLConfig:
     out_analytics: Path
     run_meta: Path
 
+    # Arrow CSV parser instead of pandas' (off = identical to previous outputs)
+    fast_io: bool = False
+    # overrides for io.PARQUET_OPTIONS (compression, row_group_size, ...)
+    parquet_options: dict = field(default_factory=dict)
+    # also write orders_clean.parquet; otherwise it is a column projection of
+    # analytics_table.parquet (listed in _run_meta.json)
+    write_derived: bool = False
+
 
 def load_inputs(cfg: ETLConfig) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Extract: read raw inputs."""
-    orders = read_orders_csv(cfg.raw_orders)
-    users = read_users_csv(cfg.raw_users)
-    return orders, users
+    """Extract: read raw inputs (both files in parallel)."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        orders = pool.submit(read_orders_csv, cfg.raw_orders, fast_io=cfg.fast_io)
+        users = pool.submit(read_users_csv, cfg.raw_users, fast_io=cfg.fast_io)
+        return orders.result(), users.result()
+
+
+def _count_na(s: pd.Series) -> int:
+    """NA count without building a boolean Series (categorical: code -1)."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return int(np.count_nonzero(s.cat.codes.to_numpy() < 0))
+    return int(np.count_nonzero(pd.isna(s.array)))
 
 
 def transform(orders_raw: pd.DataFrame, users_raw: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, dict]:
@@ -72,10 +99,12 @@ def transform(orders_raw: pd.DataFrame, users_raw: pd.DataFrame) -> tuple[pd.Dat
     assert_unique_key(users_raw, "user_id")
 
     # ---- Clean users (keep it simple) ----
-    users = users_raw.copy()
+    # assign -> new frame sharing the untouched columns with users_raw (CoW)
+    users = users_raw
     # (اختياري) تطبيع بسيط للنصوص لو عندك أعمدة نصية تحتاج
     if "country" in users.columns:
-        users["country"] = normalize_text(users["country"])
+        # low cardinality: normalize the categories, not every row
+        users = users_raw.assign(country=normalize_categories(users_raw["country"]))
 
     # ---- Clean + enrich orders ----
     status_map = {
@@ -85,18 +114,17 @@ def transform(orders_raw: pd.DataFrame, users_raw: pd.DataFrame) -> tuple[pd.Dat
         "returned": "refund",
     }
 
-    orders = (
-        orders_raw.copy()
-        .pipe(enforce_schema)
-        .assign(
-            status_clean=lambda d: apply_mapping(
-                normalize_text(d["status"]),
-                status_map,
-            )
-        )
-        .pipe(add_missing_flags, cols=["amount", "quantity", "created_at", "status"])
-        .pipe(parse_datetime, col="created_at", utc=True)
-        .pipe(add_time_parts, ts_col="created_at")
+    # all derived columns attached in a single assign (one block consolidation);
+    # missing flags are taken before created_at is parsed.
+    # Columns are built as 1-D arrays, never from a row-major 2-D ndarray, so
+    # every column stays contiguous for column-wise reductions.
+    orders = enforce_schema(orders_raw)
+    created_at, created_parts = parse_time_parts(orders["created_at"])
+    orders = orders.assign(
+        status_clean=apply_mapping(normalize_categories(orders["status"]), status_map),
+        **missing_flags(orders, ["amount", "quantity", "created_at", "status"]),
+        created_at=created_at,
+        **created_parts,
     )
 
     # outliers + winsor for charts (keep raw amount for totals too)
@@ -106,25 +134,33 @@ def transform(orders_raw: pd.DataFrame, users_raw: pd.DataFrame) -> tuple[pd.Dat
         orders = add_outlier_flag(orders, "amount")
 
     # ---- Join orders -> users (safe) ----
+    # dictionary-encode user_id with the users' (unique) keys as categories and
+    # join on the integer codes; unknown user_ids get code -1 and match nothing.
+    # `users` itself keeps user_id as a column.
+    uid_type = pd.CategoricalDtype(pd.Index(users["user_id"].astype("string")))
+    users_idx = users.drop(columns="user_id").set_axis(
+        users["user_id"].astype("string").astype(uid_type).cat.codes.to_numpy()
+    )
     analytics = safe_left_join(
-        orders,
-        users,
-        on="user_id",
+        orders.assign(_uid=orders["user_id"].astype("string").astype(uid_type).cat.codes),
+        users_idx,
+        on="_uid",
+        right_index=True,
         validate="many_to_one",
         # suffixes optional depending on your implementation
         # suffixes=("", "_user"),
         check_row_count=True,
-    )
+    ).drop(columns="_uid")
 
     # orders_clean = orders-only view (drop user-side columns that got joined)
-    user_side_cols = [c for c in users.columns if c != "user_id"]
-    orders_clean = analytics.drop(columns=[c for c in user_side_cols if c in analytics.columns], errors="ignore")
+    user_side_cols = set(users.columns) - {"user_id"}
+    orders_clean = analytics.loc[:, [c for c in analytics.columns if c not in user_side_cols]]
 
     # ---- stats for _run_meta.json ----
-    missing_created_at = int(analytics["created_at"].isna().sum()) if "created_at" in analytics.columns else None
+    missing_created_at = _count_na(analytics["created_at"]) if "created_at" in analytics.columns else None
     country_match_rate = None
-    if "country" in analytics.columns:
-        country_match_rate = float(1.0 - analytics["country"].isna().mean())
+    if "country" in analytics.columns and len(analytics):
+        country_match_rate = float(1.0 - _count_na(analytics["country"]) / len(analytics))
 
     stats = {
         "rows_in_orders_raw": int(len(orders_raw)),
@@ -141,13 +177,33 @@ def load_outputs(*, orders_clean: pd.DataFrame, users: pd.DataFrame, analytics:
     """Load: write processed artifacts (idempotent overwrite)."""
     cfg.out_orders_clean.parent.mkdir(parents=True, exist_ok=True)
 
-    write_parquet(orders_clean, cfg.out_orders_clean)
-    write_parquet(users, cfg.out_users)
-    write_parquet(analytics, cfg.out_analytics)
+    # Arrow releases the GIL while encoding, so the files are written in parallel.
+    # users is always written: the left join drops users without orders.
+    outputs = [
+        (users, cfg.out_users),
+        (analytics, cfg.out_analytics),
+    ]
+    if cfg.write_derived:
+        outputs.append((orders_clean, cfg.out_orders_clean))
+    elif cfg.out_orders_clean.exists():
+        # not deleted: run_day2_clean.py writes the same path for run_day3
+        log.warning(
+            "write_derived=False: %s is not refreshed by this run (may be stale)",
+            cfg.out_orders_clean,
+        )
+    with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+        futures = [pool.submit(write_parquet, df, path, **cfg.parquet_options) for df, path in outputs]
+        for f in futures:
+            f.result()  # re-raise any write error
 
 
-def write_run_meta(cfg: ETLConfig, *, stats: dict) -> None:
+def write_run_meta(cfg: ETLConfig, *, stats: dict, projections: dict[str, list[str]] | None = None) -> None:
+    """
+    projections: outputs not written to disk, as {name: columns of analytics_table}.
+    Re-derive with pq.read_table(analytics_table, columns=columns).
+    """
     cfg.run_meta.parent.mkdir(parents=True, exist_ok=True)
+    projections = projections or {}
 
     meta = {
         **stats,
@@ -156,17 +212,24 @@ def write_run_meta(cfg: ETLConfig, *, stats: dict) -> None:
             "users_raw": str(cfg.raw_users),
         },
         "outputs": {
-            "orders_clean": str(cfg.out_orders_clean),
+            "orders_clean": None if "orders_clean" in projections else str(cfg.out_orders_clean),
             "users": str(cfg.out_users),
             "analytics_table": str(cfg.out_analytics),
             "run_meta": str(cfg.run_meta),
         },
+        "projections": {
+            name: {"source": str(cfg.out_analytics), "columns": cols}
+            for name, cols in projections.items()
+        },
         "config": {
             "root": str(cfg.root),
         },
     }
 
-    cfg.run_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        cfg.run_meta.write_bytes(orjson.dumps(meta, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        cfg.run_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
 def run_etl(cfg: ETLConfig) -> None:
@@ -184,6 +247,7 @@ def run_etl(cfg: ETLConfig) -> None:
     load_outputs(orders_clean=orders_clean, users=users, analytics=analytics, cfg=cfg)
 
     log.info("Writing run metadata...")
-    write_run_meta(cfg, stats=stats)
+    projections = {} if cfg.write_derived else {"orders_clean": list(orders_clean.columns)}
+    write_run_meta(cfg, stats=stats, projections=projections)
 
     log.info("Done. Outputs in: %s", cfg.out_analytics.parent)
@@ -1,22 +1,95 @@
 from pathlib import Path
 import pandas as pd
 NA = ["", "NA", "N/A", "null", "None"]
-def read_orders_csv(path: Path) -> pd.DataFrame:
+# fixed raw schemas: no per-column type inference. amount/quantity stay text
+# (they hold junk like "not_a_number"); enforce_schema coerces them.
+ORDERS_DTYPES = {
+    "order_id": "string",
+    "user_id": "string",
+    "amount": "string",
+    "quantity": "string",
+    "created_at": "string",
+    "status": "category",
+}
+USERS_DTYPES = {"user_id": "string", "country": "category"}
+# zstd ~ snappy speed with smaller files; many row groups let readers parallelize
+PARQUET_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 256_000,
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+def _read_csv_arrow(path: Path, string_cols: list[str]) -> pd.DataFrame:
+    # multithreaded Arrow parser; columns stay Arrow-backed (pd.ArrowDtype)
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    convert = pa_csv.ConvertOptions(
+        column_types={c: pa.string() for c in string_cols},
+        null_values=NA,
+        strings_can_be_null=True,
+    )
+    return pa_csv.read_csv(path, convert_options=convert).to_pandas(types_mapper=pd.ArrowDtype)
+def _parse_signup_date(df: pd.DataFrame) -> pd.DataFrame:
+    # always datetime64 whatever the data: malformed dates -> NaT, not a str column
+    return df.assign(
+        signup_date=pd.to_datetime(df["signup_date"].astype("string"), format="%Y-%m-%d", errors="coerce")
+    )
+def read_orders_csv(path: Path, *, fast_io: bool = False) -> pd.DataFrame:
+    if fast_io:
+        return _read_csv_arrow(path, ["order_id", "user_id", "created_at"])
     return pd.read_csv(
         path,
-        dtype={"order_id": "string", "user_id": "string"},
+        dtype=ORDERS_DTYPES,
         na_values=NA,
         keep_default_na=True,
     )
-def read_users_csv(path: Path) -> pd.DataFrame:
+def read_users_csv(path: Path, *, fast_io: bool = False) -> pd.DataFrame:
+    if fast_io:
+        return _read_csv_arrow(path, ["user_id", "signup_date"]).pipe(_parse_signup_date)
     return pd.read_csv(
         path,
-        dtype={"user_id": "string"},
+        dtype={**USERS_DTYPES, "signup_date": "string"},
         na_values=NA,
         keep_default_na=True,
+    ).pipe(_parse_signup_date)
+def csv_to_parquet_chunked(
+    src: Path,
+    dst: Path,
+    *,
+    string_cols: list[str],
+    columns: list[str] | None = None,
+    block_size: int = 64 << 20,
+) -> None:
+    # stream CSV blocks straight into parquet row groups; peak memory ~ one block.
+    # columns not in string_cols are typed from the first block only.
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    reader = pa_csv.open_csv(
+        src,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={c: pa.string() for c in string_cols},
+            null_values=NA,
+            strings_can_be_null=True,
+            include_columns=columns,
+        ),
     )
-def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    write_parquet_chunked(reader, dst, reader.schema)
+def write_parquet_chunked(batches, path: Path, schema, **options) -> None:
+    # one writer + one fixed schema for all batches: no per-chunk schema inference
+    import pyarrow.parquet as pq
+
+    opts = {**PARQUET_OPTIONS, **options}
+    row_group_size = opts.pop("row_group_size", None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(path, schema, **opts) as writer:
+        for batch in batches:
+            writer.write_batch(batch, row_group_size=row_group_size)
+def write_parquet(df: pd.DataFrame, path: Path, **options) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(path, index=False)
+    df.to_parquet(path, index=False, **{**PARQUET_OPTIONS, **options})
 def read_parquet(path: Path) -> pd.DataFrame:
-    return pd.read_parquet(path)
\ No newline at end of file
+    return pd.read_parquet(path)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 import pandas as pd
 
+# validate modes where pandas itself proves a left join cannot add rows
+_ROW_PRESERVING = ("many_to_one", "m:1", "one_to_one", "1:1")
+
 
 def safe_left_join(
     left: pd.DataFrame,
@@ -10,28 +13,31 @@ def safe_left_join(
     validate: str = "many_to_one",
     suffixes: tuple[str, str] = ("", "_r"),
     check_row_count: bool = True,
+    right_index: bool = False,
 ) -> pd.DataFrame:
     """
     Safe left join with:
     - enforced join cardinality via `validate`
     - optional protection against join explosion
     - column name conflict handling via `suffixes`
+    - `right_index=True`: match `left[on]` against a pre-built `right` index
     """
 
-    before = len(left)
+    # many_to_one / one_to_one already guarantee len(out) == len(left);
+    # otherwise fail fast on duplicate right keys before merging
+    if check_row_count and validate not in _ROW_PRESERVING:
+        keys = [on] if isinstance(on, str) else list(on)
+        dup = right.index.duplicated() if right_index else right.duplicated(subset=keys)
+        assert not dup.any(), (
+            f"Join explosion detected: {int(dup.sum())} duplicate right keys on {keys}"
+        )
+
+    key_args = {"left_on": on, "right_index": True} if right_index else {"on": on}
 
-    out = left.merge(
+    return left.merge(
         right,
         how="left",
-        on=on,
         validate=validate,
         suffixes=suffixes,
+        **key_args,
     )
-
-    if check_row_count:
-        after = len(out)
-        assert before == after, (
-            f"Join explosion detected: {before} -> {after}"
-        )
-
-    return out
@@ -1,6 +1,12 @@
 import re
+import numpy as np
 import pandas as pd
 
+try:  # optional: JIT numeric kernels; NumPy fallback below
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 _ws = re.compile(r"\s+")
 
 
@@ -25,11 +31,12 @@ def missingness_report(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
+def missing_flags(df: pd.DataFrame, cols: list[str]) -> dict[str, pd.Series]:
+    return {f"{c}_isna": df[c].isna() for c in cols}
+
+
 def add_missing_flags(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    out = df.copy()
-    for c in cols:
-        out[f"{c}_isna"] = out[c].isna()
-    return out
+    return df.assign(**missing_flags(df, cols))
 
 
 def normalize_text(s: pd.Series) -> pd.Series:
@@ -41,18 +48,40 @@ def normalize_text(s: pd.Series) -> pd.Series:
     )
 
 
+def _recode_categories(s: pd.Series, fn) -> pd.Series:
+    """Apply `fn` to the distinct values only; equal results share a category."""
+    cat = s.astype("category")
+    if len(cat.cat.categories) == 0:  # all NA: nothing to recode
+        return cat
+    new_codes, new_cats = pd.factorize(fn(cat.cat.categories.to_series()))
+    # trailing -1 so NA (code -1) stays NA without a separate where() pass
+    codes = np.append(new_codes, -1)[cat.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=new_cats),
+        index=s.index,
+        name=s.name,
+    )
+
+
+def normalize_categories(s: pd.Series) -> pd.Series:
+    """normalize_text on the distinct values only; returns a categorical."""
+    return _recode_categories(s, normalize_text)
+
+
 def apply_mapping(s: pd.Series, mapping: dict) -> pd.Series:
-    return s.map(lambda x: mapping.get(x, x))
+    """
+    Map values via `mapping` (unmapped kept as-is); returns a categorical.
+    NA stays NA, so an all-NA input gives an all-NA result (as Series.map did).
+    """
+    return _recode_categories(s, lambda cats: cats.map(mapping).fillna(cats))
 
 # D3============================================================
 def parse_datetime( df: pd.DataFrame,col: str,*,utc: bool = True,) -> pd.DataFrame:
     dt = pd.to_datetime(df[col], errors="coerce", utc=utc)
     return df.assign(**{col: dt})
 #-------------
-def add_time_parts(df: pd.DataFrame,ts_col: str) -> pd.DataFrame:
-    ts = df[ts_col]
-
-    return df.assign(
+def time_parts(ts: pd.Series) -> dict[str, pd.Series]:
+    return dict(
         date=ts.dt.date,
         year=ts.dt.year,
         # month = ts.dt.to_period("M").astype("string")  # شهر + سنة
@@ -63,6 +92,76 @@ def add_time_parts(df: pd.DataFrame,ts_col: str) -> pd.DataFrame:
         day_name=ts.dt.day_name(), 
         hour=ts.dt.hour,
     )
+
+
+def add_time_parts(df: pd.DataFrame,ts_col: str) -> pd.DataFrame:
+    return df.assign(**time_parts(df[ts_col]))
+#-------------
+ISO_UTC = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def parse_time_parts(s: pd.Series, *, fmt: str = ISO_UTC) -> tuple[pd.Series, dict[str, pd.Series]]:
+    """
+    parse_datetime + time_parts in one Arrow pass over the strings.
+    Strings matching `fmt` are parsed by Arrow; any others (e.g. no UTC offset)
+    fall back to pd.to_datetime(utc=True, format="mixed") for those rows only,
+    so naive values are read as UTC and unparseable ones become null.
+    Already-typed timestamps are cast to UTC. Columns stay Arrow-backed.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    ts_type = pa.timestamp("us", "UTC")
+    arr = pa.array(s)
+    if pa.types.is_timestamp(arr.type):
+        ts = pc.cast(arr, ts_type, safe=False)  # truncate sub-us precision
+    else:
+        ts = pc.strptime(arr, format=fmt, unit="us", error_is_null=True)
+        failed = pc.and_(pc.is_null(ts), pc.is_valid(arr))
+        if pc.any(failed).as_py():
+            rest = pd.to_datetime(s[failed.to_numpy(zero_copy_only=False)], errors="coerce", utc=True, format="mixed")
+            ts = pc.replace_with_mask(ts, failed, pc.cast(pa.array(rest), ts_type, safe=False))
+    parts = {
+        "date": pc.cast(ts, pa.date32()),
+        "year": pc.year(ts),
+        "month": pc.month(ts),
+        "day": pc.day(ts),
+        "day_name": pc.strftime(ts, format="%A"),
+        "hour": pc.hour(ts),
+    }
+
+    def wrap(arr) -> pd.Series:
+        return pd.Series(pd.arrays.ArrowExtensionArray(arr), index=s.index)
+
+    return wrap(ts), {k: wrap(v) for k, v in parts.items()}
+#--------------
+# numeric kernels on float64 buffers; NaN compares False, so it passes through
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _winsorize_kernel(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        out = np.empty_like(x)
+        for i in prange(x.size):
+            v = x[i]
+            out[i] = lo if v < lo else (hi if v > hi else v)
+        return out
+
+    @njit(parallel=True, cache=True)
+    def _outlier_mask(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        out = np.empty(x.size, dtype=np.uint8)
+        for i in prange(x.size):
+            out[i] = (x[i] < lo) | (x[i] > hi)
+        return out
+else:
+    def _winsorize_kernel(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        return np.where(x < lo, lo, np.where(x > hi, hi, x))
+
+    def _outlier_mask(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        return ((x < lo) | (x > hi)).astype(np.uint8)
+
+
+def _float_values(s: pd.Series) -> np.ndarray:
+    return s.to_numpy(dtype="float64", na_value=np.nan)
+
 #--------------
 def iqr_bounds(s: pd.Series, k: float = 1.5) -> tuple[float, float]:
     """Return (lo, hi) IQR bounds for outlier flagging."""
@@ -75,15 +174,18 @@ def iqr_bounds(s: pd.Series, k: float = 1.5) -> tuple[float, float]:
 #--------------
 def add_outlier_flag( df: pd.DataFrame,col: str,*,k: float = 1.5) -> pd.DataFrame:
     lo, hi = iqr_bounds(df[col], k=k)
-    return df.assign(
-        **{f"{col}__is_outlier": (df[col] < lo) | (df[col] > hi)}
-    )
+    flag = pd.Series(_outlier_mask(_float_values(df[col]), lo, hi).view(bool), index=df.index)
+    if not isinstance(df[col].dtype, np.dtype):  # nullable input -> NA flag for NA
+        flag = flag.astype("boolean").mask(df[col].isna())
+    return df.assign(**{f"{col}__is_outlier": flag})
 #--------------
 def winsorize(s: pd.Series,*, p_lo: float = 0.01, p_hi: float = 0.99) -> pd.Series:
     """Cap extreme values at lower/upper quantiles."""
-    lo = s.quantile(p_lo)
-    hi = s.quantile(p_hi)
-    return s.clip(lower=lo, upper=hi)
+    lo, hi = s.quantile([p_lo, p_hi])
+    if pd.isna(lo) or pd.isna(hi):  # all NA: no bounds, nothing to cap
+        return s
+    out = pd.Series(_winsorize_kernel(_float_values(s), lo, hi), index=s.index, name=s.name)
+    return out.astype(s.dtype) if s.dtype.kind == "f" else out
 
 
 #import pandas as pd